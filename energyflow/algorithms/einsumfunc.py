@@ -16,7 +16,7 @@ from numpy.compat import basestring
 from numpy.core.multiarray import c_einsum
 from numpy.core.numeric import asarray, asanyarray, result_type, tensordot, dot
 
-__all__ = ['einsum', 'einsum_path']
+__all__ = ['einsum', 'einsum_path', 'einsum_contractions', 'einsum_contract']
 
 einsum_symbols = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
 einsum_symbols_set = set(einsum_symbols)
@@ -1310,3 +1310,88 @@ def einsum(*operands, **kwargs):
         return out_array
     else:
         return operands[0]
+
+
+def einsum_contractions(subscripts, path):
+    """
+    Precomputes the sequence of contractions that `einsum` performs when
+    given the explicit `path`, provided that every index has the same
+    dimension and BLAS is not used. The result depends only on the
+    subscripts and the path and so can be reused via `einsum_contract` for
+    any such operands, skipping the parsing and bookkeeping of `einsum_path`.
+    Parameters
+    ----------
+    subscripts : str
+        The einsum subscripts, without ellipses.
+    path : list
+        An explicit contraction path, as returned by `einsum_path`.
+    Returns
+    -------
+    contractions : list
+        List of (operand positions, einsum string) pairs.
+    """
+
+    subscripts = subscripts.replace(' ', '')
+
+    # Implicit output is the sorted indices that appear only once
+    if '->' in subscripts:
+        input_subscripts, output_subscript = subscripts.split('->')
+    else:
+        input_subscripts = subscripts
+        tmp_subscripts = subscripts.replace(',', '')
+        output_subscript = ''.join(s for s in sorted(set(tmp_subscripts))
+                                   if tmp_subscripts.count(s) == 1)
+
+    input_list = input_subscripts.split(',')
+    input_sets = [set(x) for x in input_list]
+    output_set = set(output_subscript)
+    indices = set(input_subscripts.replace(',', ''))
+
+    # mirror the special cases of einsum_path
+    if len(path) and path[0] == 'einsum_path':
+        path = path[1:]
+    if (len(input_list) in [1, 2]) or (indices == output_set):
+        path = [tuple(range(len(input_list)))]
+
+    contractions = []
+    for cnum, contract_inds in enumerate(path):
+        # Make sure we remove inds from right to left
+        contract_inds = tuple(sorted(list(contract_inds), reverse=True))
+
+        out_inds, input_sets = _find_contraction(contract_inds, input_sets, output_set)[:2]
+        tmp_inputs = [input_list.pop(x) for x in contract_inds]
+
+        # Intermediate indices are sorted by dimension then name in einsum_path
+        if (cnum - len(path)) == -1:
+            idx_result = output_subscript
+        else:
+            idx_result = "".join(sorted(out_inds))
+
+        input_list.append(idx_result)
+        contractions.append((contract_inds, ",".join(tmp_inputs) + "->" + idx_result))
+
+    return contractions
+
+
+def einsum_contract(contractions, *operands):
+    """
+    Evaluates an einsum from the contractions precomputed by
+    `einsum_contractions`.
+    Parameters
+    ----------
+    contractions : list
+        The output of `einsum_contractions`.
+    operands : list of array_like
+        The arrays for the operation.
+    Returns
+    -------
+    output : ndarray
+        The calculation based on the Einstein summation convention.
+    """
+
+    operands = list(operands)
+    for inds, einsum_str in contractions:
+        tmp_operands = [operands.pop(x) for x in inds]
+        operands.append(c_einsum(einsum_str, *tmp_operands))
+
+    return operands[0]
@@ -281,7 +281,7 @@ class NNBase(ArchBase):
         self.compile = self._proc_arg('compile', default=True)
         self.summary = self._proc_arg('summary', default=True)
 
-    def _add_act(self, act):
+    def _add_act(self, act, **kwargs):
 
         # handle case of act as a layer
         if isinstance(act, Layer):
@@ -289,11 +289,11 @@ class NNBase(ArchBase):
 
         # handle case of act being a string and in ACT_DICT
         elif isinstance(act, six.string_types) and act in ACT_DICT:
-            self.model.add(ACT_DICT[act]())
+            self.model.add(ACT_DICT[act](**kwargs))
 
         # default case of regular activation
         else:
-            self.model.add(Activation(act))
+            self.model.add(Activation(act, **kwargs))
 
     def _proc_name(self, name):
         return name if self.name_layers else None
@@ -173,9 +173,9 @@ class CNN(NNBase):
             if dropout > 0.:
                 self.model.add(Dropout(dropout, name=self._proc_name('dropout_'+str(i+num_dropout))))
 
-        # output layer
-        self.model.add(Dense(self.output_dim, name=self._proc_name('output')))
-        self._add_act(self.output_act)
+        # output layer, kept in float32 for numerical stability under mixed precision
+        self.model.add(Dense(self.output_dim, dtype='float32', name=self._proc_name('output')))
+        self._add_act(self.output_act, dtype='float32')
 
         # compile model
         self._compile_model()
@@ -71,6 +71,27 @@ class EFBase(six.with_metaclass(ABCMeta, object)):
     def _batch_compute_func(self, event):
         return self.compute(event)
 
+    def _batch_compute_imap(self, events, n_jobs):
+        """Yields the result of `_batch_compute_func` on each event in order,
+        distributing the events over `n_jobs` worker processes.
+        """
+
+        if n_jobs is None or n_jobs == -1:
+            n_jobs = multiprocessing.cpu_count() or 1
+        self.n_jobs = n_jobs
+
+        # don't bother setting up a Pool
+        if self.n_jobs == 1:
+            for result in map(self._batch_compute_func, events):
+                yield result
+            return
+
+        # setup processor pool, using several chunks per worker to balance the load
+        chunksize = min(max(len(events)//(4*self.n_jobs), 1), 10000)
+        with create_pool(self.n_jobs) as pool:
+            for result in pool.imap(self._batch_compute_func, events, chunksize):
+                yield result
+
     def batch_compute(self, events, n_jobs=None):
         """Computes the value of the observable on several events.
 
@@ -80,8 +101,8 @@ class EFBase(six.with_metaclass(ABCMeta, object)):
             - The events as an array of arrays of particles in coordinates
             matching those anticipated by `coords`.
         - **n_jobs** : _int_ or `None`
-            - The number of worker processes to use. A value of `None` will
-            use as many processes as there are CPUs on the machine.
+            - The number of worker processes to use. A value of `None` or `-1`
+            will use as many processes as there are CPUs on the machine.
 
         **Returns**
 
@@ -89,20 +110,7 @@ class EFBase(six.with_metaclass(ABCMeta, object)):
             - A vector of the observable values for each event.
         """
 
-        if n_jobs is None:
-            n_jobs = multiprocessing.cpu_count() or 1
-        self.n_jobs = n_jobs
-
-        # don't bother setting up a Pool
-        if self.n_jobs == 1:
-            return np.asarray(list(map(self._batch_compute_func, events)))
-
-        # setup processor pool
-        chunksize = min(max(len(events)//self.n_jobs, 1), 10000)
-        with create_pool(self.n_jobs) as pool:
-            results = np.asarray(list(pool.map(self._batch_compute_func, events, chunksize)))
-
-        return results
+        return np.asarray(list(self._batch_compute_imap(events, n_jobs)))
 
 ###############################################################################
 # EFPBase
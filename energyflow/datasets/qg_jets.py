@@ -53,7 +53,8 @@ import warnings
 
 import numpy as np
 
-from energyflow.utils.data_utils import _get_filepath, _pad_events_axis1
+from energyflow.utils.data_utils import (_cached_arrays_paths, _get_filepath, _load_cached_arrays,
+                                         _pad_events_axis1, _save_cached_arrays)
 
 __all__ = ['load']
 
@@ -450,7 +451,8 @@ HASHES = {
 GENERATORS = frozenset(URLS.keys())
 SOURCES = ['dropbox', 'zenodo']
 
-def load(num_data=100000, generator='pythia', pad=True, with_bc=False, cache_dir='~/.energyflow'):
+def load(num_data=100000, generator='pythia', pad=True, with_bc=False, cache_dir='~/.energyflow',
+         use_cache=True):
     """Loads samples from the dataset (which in total is contained in twenty 
     files). Any file that is needed that has not been cached will be 
     automatically downloaded. Downloading a file causes it to be cached for
@@ -476,6 +478,10 @@ def load(num_data=100000, generator='pythia', pad=True, with_bc=False, cache_dir
     - **cache_dir** : _str_
         - The directory where to store/look for the files. Note that 
         `'datasets'` is automatically appended to the end of this path.
+    - **use_cache** : _bool_
+        - Whether to save the returned arrays as `.npy` files in `cache_dir`
+        and memory map them on subsequent calls with the same arguments.
+        Only padded arrays are cached.
 
     **Returns**
 
@@ -496,6 +502,14 @@ def load(num_data=100000, generator='pythia', pad=True, with_bc=False, cache_dir
         num_files = MAX_NUM_FILES
         num_data = -1
 
+    # use arrays saved by a previous call if possible
+    if use_cache:
+        cache_fpaths = _cached_arrays_paths('qg_jets', cache_dir, num_data=num_data, generator=generator,
+                                            pad=pad, with_bc=with_bc)
+        cached = _load_cached_arrays(cache_fpaths)
+        if cached is not None:
+            return cached
+
     # index into global variables
     bc = 'bc' if with_bc else 'nobc'
     urls = URLS[generator][bc]
@@ -546,5 +560,8 @@ def load(num_data=100000, generator='pythia', pad=True, with_bc=False, cache_dir
     if num_data > -1:
         X, y = X[:num_data], y[:num_data]
 
+    if use_cache:
+        _save_cached_arrays(cache_fpaths, [X, y])
+
     return X, y
     
\ No newline at end of file
@@ -19,11 +19,12 @@ from __future__ import absolute_import, division, print_function
 
 import numpy as np
 
-from energyflow.utils.data_utils import _get_filepath
+from energyflow.utils.data_utils import (_cached_arrays_paths, _get_filepath,
+                                         _load_cached_arrays, _save_cached_arrays)
 
 __all__ = ['load']
 
-def load(num_data=-1, cache_dir='~/.energyflow'):
+def load(num_data=-1, cache_dir='~/.energyflow', use_cache=True):
     """Loads the dataset. The first time this is called, it will automatically
     download the dataset. Future calls will attempt to use the cached dataset 
     prior to redownloading.
@@ -34,6 +35,9 @@ def load(num_data=-1, cache_dir='~/.energyflow'):
         - The number of events to return. A value of `-1` means read in all events.
     - **cache_dir** : _str_
         - The directory where to store/look for the file.
+    - **use_cache** : _bool_
+        - Whether to save the returned arrays as `.npy` files in `cache_dir`
+        and memory map them on subsequent calls with the same arguments.
 
     **Returns**
 
@@ -41,6 +45,13 @@ def load(num_data=-1, cache_dir='~/.energyflow'):
         - The `X` and `y` components of the dataset as specified above.
     """
 
+    # use arrays saved by a previous call if possible
+    if use_cache:
+        cache_fpaths = _cached_arrays_paths('qg_nsubs', cache_dir, num_data=num_data)
+        cached = _load_cached_arrays(cache_fpaths)
+        if cached is not None:
+            return cached
+
     fpath = _get_filepath('QG_nsubs.npz', 
                       url='https://www.dropbox.com/s/y1l6avj5yj7jn9t/QG_nsubs.npz?dl=1',
                       file_hash='a99f771147af9b207356c990430cfeba6b6aa96fe5cff8263450ff3a31ab0997',
@@ -53,5 +64,8 @@ def load(num_data=-1, cache_dir='~/.energyflow'):
     if num_data > -1:
         X, y = X[:num_data], y[:num_data]
 
+    if use_cache:
+        _save_cached_arrays(cache_fpaths, [X, y])
+
     return X, y
     
\ No newline at end of file
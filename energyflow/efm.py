@@ -297,8 +297,8 @@ class EFM(EFMBase):
             - The events as an array of arrays of particles in coordinates
             matching those anticipated by `coords`.
         - **n_jobs** : _int_ or `None`
-            - The number of worker processes to use. A value of `None` will
-            use as many processes as there are CPUs on the machine.
+            - The number of worker processes to use. A value of `None` or `-1`
+            will use as many processes as there are CPUs on the machine.
 
         **Returns**
 
@@ -548,8 +548,8 @@ class EFMSet(EFMBase):
             - The events as an array of arrays of particles in coordinates
             matching those anticipated by `coords`.
         - **n_jobs** : _int_ or `None`
-            - The number of worker processes to use. A value of `None` will
-            use as many processes as there are CPUs on the machine.
+            - The number of worker processes to use. A value of `None` or `-1`
+            will use as many processes as there are CPUs on the machine.
 
         **Returns**
 
@@ -22,7 +22,15 @@ import warnings
 import numpy as np
 import six
 
-from energyflow.algorithms import VariableElimination, einsum_path, einsum
+# jax is an optional dependency used only by EFPSet.batch_compute_jax
+try:
+    import jax
+    import jax.numpy as jnp
+except:
+    jax = False
+
+from energyflow.algorithms import (VariableElimination, einsum, einsum_contract,
+                                   einsum_contractions, einsum_path)
 from energyflow.base import EFPBase
 from energyflow.efm import EFMSet, efp2efms
 from energyflow.measure import PF_MARKER
@@ -79,6 +87,7 @@ class EFP(EFPBase):
         # store options
         self._np_optimize = np_optimize
         self._weights = weights
+        self._einsum_contractions = None
 
         # generate our own information from the edges
         if efpset_args is not None:
@@ -158,8 +167,13 @@ class EFP(EFPBase):
         self._weight_set = frozenset(self._weights)
 
     def _efp_compute(self, zs, thetas_dict):
+
+        # the contractions depend only on the graph, so determine them once and reuse them for every event
+        if self._einsum_contractions is None:
+            self._einsum_contractions = einsum_contractions(self.einstr, self.einpath)
+
         einsum_args = [thetas_dict[w] for w in self.weights] + self._n*[zs]
-        return einsum(self.einstr, *einsum_args, optimize=self.einpath)
+        return einsum_contract(self._einsum_contractions, *einsum_args)
 
     def _efm_compute(self, efms_dict):
         einsum_args = [efms_dict[sig] for sig in self.efm_spec]
@@ -530,7 +544,7 @@ class EFPSet(EFPBase):
 
         X = np.atleast_2d(X)
 
-        results = np.empty((len(X), len(self._disc_col_inds)), dtype=float)
+        results = np.empty((len(X), len(self._disc_col_inds)), dtype=np.result_type(X, np.float32))
         for i,formula in enumerate(self._disc_col_inds):
             results[:,i] = np.prod(X[:,formula], axis=1)
 
@@ -575,7 +589,7 @@ class EFPSet(EFPBase):
         else:
             return self.calc_disc(results)
 
-    def batch_compute(self, events, n_jobs=None):
+    def batch_compute(self, events, n_jobs=None, dtype=float):
         """Computes the value of the stored EFPs on several events.
 
         **Arguments**
@@ -584,8 +598,13 @@ class EFPSet(EFPBase):
             - The events as an array of arrays of particles in coordinates
             matching those anticipated by `coords`.
         - **n_jobs** : _int_ or `None`
-            - The number of worker processes to use. A value of `None` will
-            attempt to use as many processes as there are CPUs on the machine.
+            - The number of worker processes to use. A value of `None` or `-1`
+            will attempt to use as many processes as there are CPUs on the
+            machine.
+        - **dtype** : _numpy.dtype_
+            - The dtype of the returned array. Each event is still computed in
+            double precision, so e.g. `numpy.float32` halves the memory of
+            the result without affecting the individual values beyond rounding.
 
         **Returns**
 
@@ -593,7 +612,99 @@ class EFPSet(EFPBase):
             - An array of the EFP values for each event.
         """
 
-        return self.calc_disc(super(EFPSet, self).batch_compute(events, n_jobs))
+        # fill a preallocated array with the connected EFPs as they arrive
+        results = np.empty((len(events), len(self._efps)), dtype=dtype)
+        for i,result in enumerate(self._batch_compute_imap(events, n_jobs)):
+            results[i] = result
+
+        return self.calc_disc(results)
+
+    def batch_compute_jax(self, events, max_particles=None, batch_size=1000, max_c=2):
+        """Computes the value of the stored EFPs on several events using
+        [JAX](https://github.com/google/jax). The EFP contractions are
+        vectorized over events and compiled with XLA, so they can run on a
+        GPU if one is available. Events are zero-padded to a common number of
+        particles and processed in batches of a fixed size. Note that JAX
+        uses single precision unless `jax_enable_x64` has been set. EFM
+        measures are not supported by this method, in which case
+        `batch_compute` is used instead. The measure and the EFPs with VE
+        complexity greater than `max_c` are evaluated serially, so on a
+        machine without an accelerator `batch_compute` with `n_jobs` is
+        typically faster.
+
+        **Arguments**
+
+        - **events** : array_like or `fastjet.PseudoJet`
+            - The events as an array of arrays of particles in coordinates
+            matching those anticipated by `coords`.
+        - **max_particles** : _int_ or `None`
+            - The number of particles that each event is padded to. If `None`,
+            the largest multiplicity among the events is used.
+        - **batch_size** : _int_
+            - The number of events that are contracted at once.
+        - **max_c** : _int_
+            - Connected EFPs with VE complexity greater than this are computed
+            with NumPy on the unpadded events, since the cost (and memory) of
+            their contraction grows as `batch_size*max_particles**c`.
+
+        **Returns**
+
+        - _2-d numpy.ndarray_
+            - An array of the EFP values for each event.
+        """
+
+        if not jax:
+            raise NotImplementedError("batch_compute_jax requires module 'jax', which is unavailable")
+
+        if self.use_efms:
+            return self.batch_compute(events)
+
+        # evaluate the measure on each event
+        zs_thetas = [self._measure.evaluate(event) for event in events]
+        mults = [len(zs) for zs,thetas in zs_thetas]
+        if max_particles is None:
+            max_particles = max(mults)
+        elif max(mults) > max_particles:
+            raise ValueError('an event has more than max_particles particles')
+
+        # determine which EFPs are handled by jax
+        jax_inds = [i for i,efp in enumerate(self._efps) if efp.c <= max_c]
+        np_inds = [i for i,efp in enumerate(self._efps) if efp.c > max_c]
+        jax_efps = [self._efps[i] for i in jax_inds]
+        jax_weights = frozenset(w for efp in jax_efps for w in efp.weight_set)
+
+        # reuse the VE contraction paths rather than having jax search for them
+        jax_einpaths = [[tuple(c) for c in efp.einpath[1:]] for efp in jax_efps]
+
+        def efps_func(zs, thetas):
+            thetas_dict = {w: thetas**w for w in jax_weights}
+            return jnp.stack([jnp.einsum(efp.einstr, *([thetas_dict[w] for w in efp.weights] + efp.n*[zs]),
+                                         optimize=einpath) for efp,einpath in zip(jax_efps, jax_einpaths)])
+
+        results = np.empty((len(events), len(self._efps)))
+
+        # contract padded batches of events, every batch having the same shape
+        if len(jax_inds):
+            compute = jax.jit(jax.vmap(efps_func))
+            batch_size = min(batch_size, len(events))
+            for start in range(0, len(events), batch_size):
+                batch = zs_thetas[start:start+batch_size]
+                zs = np.zeros((batch_size, max_particles))
+                thetas = np.zeros((batch_size, max_particles, max_particles))
+                for j,(event_zs,event_thetas) in enumerate(batch):
+                    m = len(event_zs)
+                    zs[j,:m], thetas[j,:m,:m] = event_zs, event_thetas
+                results[start:start+len(batch),jax_inds] = np.asarray(compute(zs, thetas))[:len(batch)]
+
+        # compute the remaining EFPs with numpy
+        if len(np_inds):
+            np_efps = [self._efps[i] for i in np_inds]
+            np_weights = frozenset(w for efp in np_efps for w in efp.weight_set)
+            for i,(zs,thetas) in enumerate(zs_thetas):
+                thetas_dict = {w: thetas**w for w in np_weights}
+                results[i,np_inds] = [efp._efp_compute(zs, thetas_dict) for efp in np_efps]
+
+        return self.calc_disc(results)
 
     # sel(*args)
     def sel(self, *args, **kwargs):
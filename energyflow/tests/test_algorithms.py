@@ -1,5 +1,6 @@
 from __future__ import absolute_import
 
+import numpy as np
 import pytest
 
 from energyflow.algorithms import *
@@ -20,4 +21,12 @@ def test_int_partition_ordered_len(n, ans):
 
 def test_ve_attrs():
     ve = VariableElimination()
-    assert hasattr(ve, 'einspecs')
\ No newline at end of file
+    assert hasattr(ve, 'einspecs')
+
+@pytest.mark.parametrize('M', [1, 2, 10])
+@pytest.mark.parametrize('subscripts', ['a->', 'ab,a,b', 'ab,ac,bc,a,b,c->', 'ab,bc,cd,da,a,b,c,d'])
+def test_einsum_contractions(subscripts, M):
+    operands = [np.random.rand(*([M]*len(term))) for term in subscripts.split('->')[0].split(',')]
+    path = einsum_path(subscripts, *operands, optimize='greedy')[0]
+    contractions = einsum_contractions(subscripts, path)
+    assert np.allclose(einsum_contract(contractions, *operands), einsum(subscripts, *operands, optimize=path))
@@ -87,6 +87,41 @@ def test_batch_compute_vs_compute(measure, beta, kappa, normed):
     r = np.asarray([s.compute(event) for event in events])
     assert epsilon_percent(r_batch, r, 10**-14)
 
+@pytest.mark.efp
+@pytest.mark.parametrize('n_jobs', [1, 2, -1])
+@pytest.mark.parametrize('measure', ['hadr', 'hadrefm'])
+def test_batch_compute_n_jobs(measure, n_jobs):
+    events = ef.gen_random_events(50, 15)
+    s = ef.EFPSet('d<=4', measure=measure, beta=2)
+    r_batch = s.batch_compute(events, n_jobs=n_jobs)
+    r = np.asarray([s.compute(event) for event in events])
+    assert r_batch.shape == r.shape
+    assert epsilon_percent(r_batch, r, 10**-14)
+
+@pytest.mark.efp
+@pytest.mark.parametrize('measure', ['hadr', 'hadrefm'])
+def test_batch_compute_dtype(measure):
+    events = ef.gen_random_events(20, 15)
+    s = ef.EFPSet('d<=4', measure=measure, beta=2)
+    r_batch = s.batch_compute(events, n_jobs=1, dtype=np.float32)
+    r = np.asarray([s.compute(event) for event in events])
+    assert r_batch.dtype == np.float32
+    assert np.allclose(r_batch, r, rtol=10**-6, atol=0)
+
+@pytest.mark.efp
+@pytest.mark.parametrize('max_c', [1, 2, 3])
+@pytest.mark.parametrize('measure', ['hadr', 'hadrdot', 'ee'])
+def test_batch_compute_jax(measure, max_c):
+    pytest.importorskip('jax')
+    events = [event[:np.random.randint(2, 16)] for event in ef.gen_random_events(20, 15)]
+    s = ef.EFPSet('d<=4', measure=measure, beta=0.5)
+    r_jax = s.batch_compute_jax(events, batch_size=8, max_c=max_c)
+    r = s.batch_compute(events, n_jobs=1)
+    assert r_jax.shape == r.shape
+
+    # jax may be using single precision, and some EFPs vanish on small events
+    assert np.allclose(r_jax, r, rtol=10**-4, atol=10**-12)
+
 # test that efpset matches efps
 @pytest.mark.slow
 @pytest.mark.efp
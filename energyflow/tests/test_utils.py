@@ -1,5 +1,7 @@
 from __future__ import absolute_import, division
 
+import os
+
 import numpy as np
 import pytest
 import six
@@ -377,6 +379,102 @@ def test_pids2chrgs(nevents, nparticles):
     assert ef.pids2chrgs(211) == 1.
     assert ef.pids2chrgs(-211) == -1.
 
+# test generic utils
+
+@pytest.mark.utils
+@pytest.mark.parametrize('alignment', [64, 4096])
+@pytest.mark.parametrize('dtype', [float, np.float32, np.int8])
+@pytest.mark.parametrize('shape', [(1,), (10, 3), (4, 5, 5, 2)])
+def test_aligned_empty(shape, dtype, alignment):
+    arr = ef.utils.aligned_empty(shape, dtype=dtype, alignment=alignment)
+    assert arr.shape == shape and arr.dtype == dtype
+    assert arr.ctypes.data % alignment == 0 and arr.flags.c_contiguous
+
+# test data utils
+
+@pytest.mark.utils
+def test_cached_arrays(tmpdir):
+    from energyflow.utils.data_utils import _cached_arrays_paths, _load_cached_arrays, _save_cached_arrays
+    fpaths = _cached_arrays_paths('test', str(tmpdir), num_data=10, pad=True)
+    assert fpaths != _cached_arrays_paths('test', str(tmpdir), num_data=10, pad=False)
+    assert _load_cached_arrays(fpaths) is None
+
+    # save and memory map
+    X, y = np.random.rand(10, 5, 4), np.random.randint(2, size=10)
+    _save_cached_arrays(fpaths, [X, y])
+    X_cached, y_cached = _load_cached_arrays(fpaths)
+    assert isinstance(X_cached, np.memmap) and isinstance(y_cached, np.memmap)
+    assert np.all(X_cached == X) and np.all(y_cached == y)
+
+    # modifications are copy-on-write
+    X_cached[0] = -1.
+    assert np.all(np.load(fpaths[0]) == X)
+
+@pytest.mark.utils
+def test_cached_arrays_not_saved(tmpdir, monkeypatch):
+    from energyflow.utils.data_utils import _cached_arrays_paths, _load_cached_arrays, _save_cached_arrays
+    fpaths = _cached_arrays_paths('test', str(tmpdir))
+    datadir = os.path.dirname(fpaths[0])
+
+    # object arrays are skipped
+    X = np.asarray([np.random.rand(3, 4), np.random.rand(5, 4)], dtype='O')
+    _save_cached_arrays(fpaths, [X, np.zeros(2)])
+    assert _load_cached_arrays(fpaths) is None
+
+    # failed writes warn and leave no files behind
+    def bad_save(f, arr):
+        f.write(b'partial')
+        raise IOError('disk full')
+    monkeypatch.setattr(np, 'save', bad_save)
+    with pytest.warns(UserWarning):
+        _save_cached_arrays(fpaths, [np.random.rand(2, 3), np.zeros(2)])
+    assert len(os.listdir(datadir)) == 0
+
+# test image utils
+
+def random_jets(nevents, nparticles):
+    jets = np.zeros((nevents, nparticles, 4))
+    for jet in jets:
+        n = np.random.randint(1, nparticles + 1)
+        jet[:n,0] = np.random.rand(n)
+        jet[:n,1:3] = 0.25*np.random.randn(n, 2)
+        jet[:n,3] = np.random.choice([22, 211, -211, 130, 2212, -11], size=n)
+    return jets
+
+@pytest.mark.utils
+@pytest.mark.parametrize('charged_counts_only', [False, True])
+@pytest.mark.parametrize('norm', [False, True])
+@pytest.mark.parametrize('nb_chan', [1, 2])
+@pytest.mark.parametrize('nparticles', [1, 50])
+def test_pixelate_batch(nparticles, nb_chan, norm, charged_counts_only):
+    jets = random_jets(20, nparticles)
+    kwargs = {'npix': 17, 'nb_chan': nb_chan, 'norm': norm, 'charged_counts_only': charged_counts_only}
+
+    images = np.asarray([ef.utils.pixelate(jet, **kwargs) for jet in jets])
+    assert epsilon_diff(ef.utils.pixelate_batch(jets, **kwargs), images)
+
+    # ragged jets
+    masked_jets = [jet[jet[:,0] > 0] for jet in jets]
+    assert epsilon_diff(ef.utils.pixelate_batch(masked_jets, **kwargs), images)
+
+@pytest.mark.utils
+@pytest.mark.parametrize('std_channels', [None, [], [1]])
+@pytest.mark.parametrize('channels', [None, [0], [1]])
+def test_zero_center_and_standardize(channels, std_channels):
+    X_train, X_test = np.random.rand(50, 9, 9, 2), np.random.rand(20, 9, 9, 2)
+    all_chans = list(range(2))
+    std_chans = channels if std_channels is None else std_channels
+    Y_train, Y_test = ef.utils.standardize(*ef.utils.zero_center(X_train, X_test, copy=True,
+                                                                 channels=all_chans if channels is None else channels),
+                                           channels=all_chans if std_chans is None else std_chans)
+
+    # in place
+    kwargs = {} if std_channels is None else {'std_channels': std_channels}
+    Z_train, Z_test = ef.utils.zero_center_and_standardize(X_train, X_test, channels=channels, **kwargs)
+    assert Z_train is X_train and Z_test is X_test
+    assert epsilon_diff(Z_train, Y_train, 10**-12)
+    assert epsilon_diff(Z_test, Y_test, 10**-12)
+
 # test graph utils
 
 @pytest.mark.utils
@@ -9,6 +9,7 @@ from __future__ import absolute_import, division, print_function
 import hashlib
 import os
 import sys
+import warnings
 
 import numpy as np
 from six.moves.urllib.error import HTTPError, URLError
@@ -99,6 +100,10 @@ def data_split(*args, **kwargs):
     - **shuffle** : _bool_
         - A flag to control whether the dataset is shuffled prior to
         being split into parts.
+    - **shuffle_seed** : _int_
+        - If not `None`, the seed of the random generator used to shuffle
+        the dataset, so that the same split is obtained each time.
+        Otherwise, the global NumPy random state is used.
 
     **Returns**
 
@@ -111,7 +116,7 @@ def data_split(*args, **kwargs):
 
     # handle valid kwargs
     train, val, test = kwargs.pop('train', -1), kwargs.pop('val', 0.0), kwargs.pop('test', 0.1)
-    shuffle = kwargs.pop('shuffle', True)
+    shuffle, shuffle_seed = kwargs.pop('shuffle', True), kwargs.pop('shuffle_seed', None)
     if len(kwargs):
         raise TypeError('following kwargs are invalid: {}'.format(kwargs))
 
@@ -132,7 +137,14 @@ def data_split(*args, **kwargs):
     assert num_train + num_val + num_test <= n_samples, 'too few samples for requested data split'
     
     # calculate masks 
-    perm = np.random.permutation(n_samples) if shuffle else np.arange(n_samples)
+    if not shuffle:
+        perm = np.arange(n_samples)
+    elif shuffle_seed is None:
+        perm = np.random.permutation(n_samples)
+    elif hasattr(np.random, 'default_rng'):
+        perm = np.random.default_rng(shuffle_seed).permutation(n_samples)
+    else:
+        perm = np.random.RandomState(shuffle_seed).permutation(n_samples)
     train_mask = perm[:num_train]
     val_mask = perm[-num_val:]
     test_mask = perm[num_train:num_train+num_test]
@@ -254,6 +266,52 @@ def _pad_events_axis1(events, axis1_shape):
 
     return events
 
+def _cached_arrays_paths(name, cache_dir, **kwargs):
+    """Determines the files where the arrays returned by the dataset loader
+    `name` with arguments `kwargs` are cached.
+    """
+
+    key = hashlib.sha256(repr(sorted(kwargs.items())).encode('utf-8')).hexdigest()[:16]
+    datadir = os.path.join(os.path.expanduser(cache_dir), 'datasets', 'cache')
+    return [os.path.join(datadir, '{}_{}_{}.npy'.format(name, key, i)) for i in range(2)]
+
+def _load_cached_arrays(fpaths):
+    """Memory maps previously cached arrays, returning `None` if they are not
+    all present. Arrays are mapped copy-on-write so they may be modified in
+    memory without affecting the cache.
+    """
+
+    if not all(os.path.exists(fpath) for fpath in fpaths):
+        return None
+
+    return [np.load(fpath, mmap_mode='c') for fpath in fpaths]
+
+def _save_cached_arrays(fpaths, arrays):
+    """Caches arrays so that they can later be memory mapped. Object arrays
+    cannot be memory mapped and so are not cached.
+    """
+
+    if any(arr.dtype == object for arr in arrays):
+        return
+
+    try:
+        datadir = os.path.dirname(fpaths[0])
+        if not os.path.exists(datadir):
+            os.makedirs(datadir)
+        # write to a temporary file first so that a partial write is never loaded
+        for fpath, arr in zip(fpaths, arrays):
+            with open(fpath + '.part', 'wb') as f:
+                np.save(f, arr)
+            os.rename(fpath + '.part', fpath)
+
+    # the cache is only an optimization, so don't fail if it can't be written
+    except (IOError, OSError) as e:
+        warnings.warn('Could not cache dataset arrays: {}'.format(e))
+        for fpath in fpaths:
+            for path in (fpath, fpath + '.part'):
+                if os.path.exists(path):
+                    os.remove(path)
+
 def _hash_file(fpath, algorithm='sha256', chunk_size=131071):
     """Calculates a file sha256 or md5 hash.
     # Example
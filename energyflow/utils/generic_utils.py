@@ -21,6 +21,7 @@ __all__ = [
     'EF_DATA_DIR',
     'REVERSE_COMPS',
     'ZENODO_URL_PATTERN',
+    'aligned_empty',
     'concat_specs',
     'create_pool',
     'explicit_comp',
@@ -83,6 +84,14 @@ if sys.version_info[0] == 2:
 
     copy_reg.pickle(types.MethodType, pickle_method, unpickle_method)
 
+# returns an uninitialized array whose data is aligned to the given number of bytes
+def aligned_empty(shape, dtype=float, alignment=4096):
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    buf = np.empty(nbytes + alignment, dtype=np.uint8)
+    offset = -buf.ctypes.data % alignment
+    return buf[offset:offset+nbytes].view(dtype).reshape(shape)
+
 # concatenates con. and disc. specs along axis 0, handling empty disc. specs
 def concat_specs(c_specs, d_specs):
     if len(d_specs):
@@ -8,10 +8,19 @@ from __future__ import absolute_import, division, print_function
 
 import numpy as np
 
+from energyflow.utils.generic_utils import aligned_empty
+
+try:
+    from numba import njit
+except:
+    njit = False
+
 __all__ = [
     'pixelate',
+    'pixelate_batch',
     'standardize',
     'zero_center',
+    'zero_center_and_standardize',
 ]
 
 # PDGid to isCharged dictionary
@@ -23,6 +32,7 @@ pid2abschg_mapping = {22: 0,             # photon
                       2212: 1, -2212: 1, # proton, anti-proton
                       11: 1, -11: 1,     # electron, positron
                       13: 1, -13: 1}     # muon, anti-muon
+charged_pids = np.asarray([pid for pid,chg in pid2abschg_mapping.items() if chg])
 
 def pixelate(jet, npix=33, img_width=0.8, nb_chan=1, norm=True, charged_counts_only=False):
     """A function for creating a jet image from an array of particles.
@@ -59,9 +69,11 @@ def pixelate(jet, npix=33, img_width=0.8, nb_chan=1, norm=True, charged_counts_o
     # set columns
     (pT_i, rap_i, phi_i, pid_i) = (0, 1, 2, 3)
 
+    if nb_chan not in (1, 2):
+        raise ValueError('nb_chan must be 1 or 2')
+
     # the image is (img_width x img_width) in size
     pix_width = img_width / npix
-    jet_image = np.zeros((npix, npix, nb_chan))
 
     # remove particles with zero pt
     jet = jet[jet[:,pT_i] > 0]
@@ -72,37 +84,18 @@ def pixelate(jet, npix=33, img_width=0.8, nb_chan=1, norm=True, charged_counts_o
     rap_pt_cent_index = np.ceil(rap_avg/pix_width - 0.5) - np.floor(npix / 2)
     phi_pt_cent_index = np.ceil(phi_avg/pix_width - 0.5) - np.floor(npix / 2)
 
-    # center image and transition to indices
-    rap_indices = np.ceil(jet[:,rap_i]/pix_width - 0.5) - rap_pt_cent_index
-    phi_indices = np.ceil(jet[:,phi_i]/pix_width - 0.5) - phi_pt_cent_index
-
-    # delete elements outside of range
-    mask = np.ones(jet[:,rap_i].shape).astype(bool)
-    mask[rap_indices < 0] = False
-    mask[phi_indices < 0] = False
-    mask[rap_indices >= npix] = False
-    mask[phi_indices >= npix] = False
-    rap_indices = rap_indices[mask].astype(int)
-    phi_indices = phi_indices[mask].astype(int)
-
-    # construct grayscale image
-    if nb_chan == 1: 
-        for pt,y,phi in zip(jet[:,pT_i][mask], rap_indices, phi_indices): 
-            jet_image[phi, y, 0] += pt
-
-    # construct two-channel image
-    elif nb_chan == 2:
-        if charged_counts_only:
-            for pt,y,phi,pid in zip(jet[:,pT_i][mask], rap_indices, 
-                                    phi_indices, jet[:,pid_i][mask].astype(int)):
-                jet_image[phi, y, 0] += pt
-                jet_image[phi, y, 1] += pid2abschg_mapping.get(pid, 0)
-        else:
-            for pt,y,phi in zip(jet[:,pT_i][mask], rap_indices, phi_indices): 
-                jet_image[phi, y, 0] += pt
-                jet_image[phi, y, 1] += 1
+    # determine what each particle contributes to the count channel
+    if nb_chan == 2 and charged_counts_only:
+        counts = np.isin(jet[:,pid_i].astype(int), charged_pids).astype(float)
     else:
-        raise ValueError('nb_chan must be 1 or 2')
+        counts = np.ones(len(jet))
+
+    # center image and bin the particles
+    jet_image = _pixelate_particles(np.ascontiguousarray(jet[:,pT_i]), 
+                                    np.ascontiguousarray(jet[:,rap_i]), 
+                                    np.ascontiguousarray(jet[:,phi_i]), counts, 
+                                    rap_pt_cent_index, phi_pt_cent_index, 
+                                    pix_width, npix, nb_chan)
 
     # L1-normalize the pt channels of the jet image
     if norm:
@@ -114,6 +107,150 @@ def pixelate(jet, npix=33, img_width=0.8, nb_chan=1, norm=True, charged_counts_o
 
     return jet_image
 
+# bins particles (already stripped of zero pt ones) into a single jet image
+def _pixelate_particles(pts, raps, phis, counts, rap_pt_cent_index, phi_pt_cent_index,
+                        pix_width, npix, nb_chan):
+
+    jet_image = np.zeros((npix, npix, nb_chan))
+
+    # center image and transition to indices
+    rap_indices = np.ceil(raps/pix_width - 0.5) - rap_pt_cent_index
+    phi_indices = np.ceil(phis/pix_width - 0.5) - phi_pt_cent_index
+
+    # zero the contributions of particles outside of range rather than removing them
+    valid = ((rap_indices >= 0) & (rap_indices < npix) & (phi_indices >= 0) & (phi_indices < npix)).astype(float)
+    rap_indices = np.clip(rap_indices, 0, npix - 1).astype(int)
+    phi_indices = np.clip(phi_indices, 0, npix - 1).astype(int)
+
+    # accumulate all of the particles with a single scatter per channel
+    np.add.at(jet_image[...,0], (phi_indices, rap_indices), pts*valid)
+    if nb_chan == 2:
+        np.add.at(jet_image[...,1], (phi_indices, rap_indices), counts*valid)
+
+    return jet_image
+
+# numba version of the above, which can afford a loop over particles
+if njit:
+
+    @njit(cache=True)
+    def _pixelate_particles(pts, raps, phis, counts, rap_pt_cent_index, phi_pt_cent_index,
+                            pix_width, npix, nb_chan):
+
+        jet_image = np.zeros((npix, npix, nb_chan))
+        for i in range(len(pts)):
+
+            # center image and transition to indices
+            rap_index = np.ceil(raps[i]/pix_width - 0.5) - rap_pt_cent_index
+            phi_index = np.ceil(phis[i]/pix_width - 0.5) - phi_pt_cent_index
+
+            # skip particles outside of range
+            if rap_index < 0 or phi_index < 0 or rap_index >= npix or phi_index >= npix:
+                continue
+
+            y, phi = int(rap_index), int(phi_index)
+            jet_image[phi, y, 0] += pts[i]
+            if nb_chan == 2:
+                jet_image[phi, y, 1] += counts[i]
+
+        return jet_image
+
+def pixelate_batch(jets, npix=33, img_width=0.8, nb_chan=1, norm=True, charged_counts_only=False):
+    """A function for creating jet images from many jets at once. The 
+    resulting images are identical to those obtained by calling 
+    [`pixelate`](#pixelate) on each jet, but all of the particles are 
+    binned in a single vectorized pass instead of one Python call per jet.
+
+    **Arguments**
+
+    - **jets** : _numpy.ndarray_ or _list_ of _numpy.ndarray_
+        - The jets, either as a 3-d array of (possibly zero-padded) particles
+        or as a list (or object array) of 2-d arrays of particles, where each
+        particle is of the form `[pt,y,phi,pid]`, as for `pixelate`.
+    - **npix** : _int_
+        - The number of pixels on one edge of the jet images, which are
+        taken to be square.
+    - **img_width** : _float_
+        - The size of one edge of the jet images in the rapidity-azimuth
+        plane.
+    - **nb_chan** : {`1`, `2`}
+        - The number of channels in the jet images. See `pixelate`.
+    - **norm** : _bool_
+        - Whether to normalize the $p_T$ pixels of each image to sum to `1`.
+    - **charged_counts_only** : _bool_
+        - If making a count channel, whether to only include charged 
+        particles. Requires that `pid` information be given.
+
+    **Returns**
+
+    - _4-d numpy.ndarray_
+        - The jet images as a `(num_jets, npix, npix, nb_chan)` array, 
+        allocated aligned to a page boundary for efficient copying to 
+        accelerators.
+    """
+
+    # set columns
+    (pT_i, rap_i, phi_i, pid_i) = (0, 1, 2, 3)
+
+    if nb_chan not in (1, 2):
+        raise ValueError('nb_chan must be 1 or 2')
+
+    # flatten all the particles into a single array, tagging each with its jet id
+    num_jets = len(jets)
+    if isinstance(jets, np.ndarray) and jets.ndim == 3:
+        particles = jets.reshape(-1, jets.shape[-1])
+        jet_ids = np.repeat(np.arange(num_jets), jets.shape[1])
+    else:
+        counts = np.asarray([len(jet) for jet in jets], dtype=int)
+        particles = np.concatenate(jets, axis=0)
+        jet_ids = np.repeat(np.arange(num_jets), counts)
+
+    # remove particles with zero pt
+    mask = particles[:,pT_i] > 0
+    particles, jet_ids = particles[mask], jet_ids[mask]
+    pts = particles[:,pT_i]
+
+    # get pt centroid values of each jet
+    pt_sums = np.bincount(jet_ids, weights=pts, minlength=num_jets)
+    if np.any(pt_sums == 0):
+        raise FloatingPointError('Image had no particles!')
+    rap_avgs = np.bincount(jet_ids, weights=pts*particles[:,rap_i], minlength=num_jets)/pt_sums
+    phi_avgs = np.bincount(jet_ids, weights=pts*particles[:,phi_i], minlength=num_jets)/pt_sums
+
+    # the images are (img_width x img_width) in size
+    pix_width = img_width / npix
+    rap_pt_cent_indices = np.ceil(rap_avgs/pix_width - 0.5) - np.floor(npix / 2)
+    phi_pt_cent_indices = np.ceil(phi_avgs/pix_width - 0.5) - np.floor(npix / 2)
+
+    # center images and transition to indices
+    rap_indices = np.ceil(particles[:,rap_i]/pix_width - 0.5) - rap_pt_cent_indices[jet_ids]
+    phi_indices = np.ceil(particles[:,phi_i]/pix_width - 0.5) - phi_pt_cent_indices[jet_ids]
+
+    # delete elements outside of range
+    mask = (rap_indices >= 0) & (phi_indices >= 0) & (rap_indices < npix) & (phi_indices < npix)
+    pix_indices = ((jet_ids[mask]*npix + phi_indices[mask].astype(int))*npix 
+                   + rap_indices[mask].astype(int))*nb_chan
+
+    # scatter the pts (and counts) into flattened, page-aligned images
+    jet_images = aligned_empty((num_jets, npix, npix, nb_chan))
+    jet_images.fill(0.)
+    flat_images = jet_images.reshape(-1)
+    np.add.at(flat_images, pix_indices, pts[mask])
+    if nb_chan == 2:
+        if charged_counts_only:
+            counts = np.isin(particles[mask,pid_i].astype(int), charged_pids).astype(float)
+        else:
+            counts = 1
+        np.add.at(flat_images, pix_indices + 1, counts)
+
+    # L1-normalize the pt channels of the jet images
+    if norm:
+        normfactors = np.sum(jet_images[...,0], axis=(1,2))
+        if np.any(normfactors == 0):
+            raise FloatingPointError('Image had no particles!')
+        jet_images[...,0] /= normfactors[:,np.newaxis,np.newaxis]
+
+    return jet_images
+
 # standardize(*args, channels=None, copy=False, reg=10**-10)
 def standardize(*args, **kwargs):
     """Normalizes each argument by the standard deviation of the pixels in 
@@ -216,3 +353,71 @@ def zero_center(*args, **kwargs):
             x[...,chan] -= mean[...,chan]
 
     return X
+
+# zero_center_and_standardize(*args, channels=None, copy=False, reg=10**-10)
+def zero_center_and_standardize(*args, **kwargs):
+    """Subtracts the mean of args[0] from the arguments and then normalizes
+    them by the standard deviation of the pixels in args[0], in a single
+    in-place pass over each argument. This is equivalent to (but uses less
+    memory than) `standardize(*zero_center(*args, channels=channels),
+    channels=std_channels)`. The expected use case would be
+    `zero_center_and_standardize(X_train, X_val, X_test)`.
+
+    **Arguments**
+
+    - ***args** : arbitrary _numpy.ndarray_ datasets
+        - An arbitrary number of float datasets, each required to have
+        the same shape in all but the first axis.
+    - **channels** : _int_
+        - A list of which channels (assumed to be the last axis)
+        to process. `None` is interpretted to mean every channel.
+    - **std_channels** : _int_
+        - A list of which channels to standardize after zero centering,
+        defaulting to `channels`. An empty list only zero centers.
+    - **copy** : _bool_
+        - Whether or not to copy the input arrays before modifying them.
+    - **reg** : _float_
+        - Small parameter used to avoid dividing by zero. It's important
+        that this be kept consistent for images used with a given model.
+
+    **Returns**
+
+    - _list_ 
+        - A list of the zero-centered and standardized arguments.
+    """
+
+    channels = kwargs.pop('channels', None)
+    std_channels = kwargs.pop('std_channels', channels)
+    copy = kwargs.pop('copy', False)
+    reg = kwargs.pop('reg', 10**-10)
+
+    if len(kwargs):
+        raise TypeError('following kwargs are invalid: {}'.format(kwargs))
+
+    assert len(args) > 0
+
+    # compute mean and stds of the first argument
+    mean = np.mean(args[0], axis=0)
+    stds = np.std(args[0], axis=0) + reg if std_channels is None or len(std_channels) else None
+
+    # copy arguments if requested
+    if copy: 
+        X = [np.copy(arg) for arg in args]
+    else: 
+        X = args
+
+    # iterate through arguments, treating all channels at once if possible
+    for x in X:
+        if channels is None:
+            np.subtract(x, mean, out=x)
+        else:
+            for chan in channels:
+                x[...,chan] -= mean[...,chan]
+
+        if std_channels is None:
+            np.divide(x, stds, out=x)
+        else:
+            for chan in std_channels:
+                x[...,chan] /= stds[...,chan]
+
+    return X
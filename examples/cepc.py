@@ -6,11 +6,13 @@ import uproot as ur
 import awkward1 as ak
 import numpy as np
 
-from energyflow.utils.data_utils import _get_filepath, _pad_events_axis1
+from energyflow.utils.data_utils import (_cached_arrays_paths, _get_filepath, _load_cached_arrays,
+                                         _pad_events_axis1, _save_cached_arrays)
 
 __all__ = ['load']
 
-def load(num_data=10000, generator='pythia', pad=True, with_bc=True, cache_dir="/.energyflow/datasets"):
+def load(num_data=10000, generator='pythia', pad=True, with_bc=True, cache_dir="/.energyflow/datasets",
+         use_cache=True):
 
     def_path = os.getenv('HOME')
     # obtain files
@@ -23,6 +25,14 @@ def load(num_data=10000, generator='pythia', pad=True, with_bc=True, cache_dir="
     except Exception as e:
         print(str(e))
 
+    # memory map arrays saved by a previous call, keyed on the ROOT file's modification time
+    if use_cache:
+        cache_fpaths = _cached_arrays_paths('cepc', os.path.dirname(cache_dir), num_data=num_data,
+                                            pad=pad, mtime=os.path.getmtime(fpath))
+        cached = _load_cached_arrays(cache_fpaths)
+        if cached is not None:
+            return cached
+
     f = ur.open(fpath)["cmb"] #open the tree
     if f:
         print(f.show()) # show tuples
@@ -59,5 +69,8 @@ def load(num_data=10000, generator='pythia', pad=True, with_bc=True, cache_dir="
     if num_data > -1:
         X, y = X[:num_data], y[:num_data]
 
+    if use_cache:
+        _save_cached_arrays(cache_fpaths, [X, y])
+
     return X, y
     
@@ -3,17 +3,18 @@ from __future__ import absolute_import, division, print_function
 
 # standard numerical library imports
 import numpy as np
+import tensorflow as tf
 
 # energyflow imports
 import energyflow as ef
 from energyflow.archs import DNN
 from energyflow.datasets import qg_nsubs
-from energyflow.utils import data_split, to_categorical
+from energyflow.utils import data_split
 print('-----imports succeed-------')
 
 # attempt to import sklearn
 try:
-    from sklearn.metrics import roc_auc_score, roc_curve
+    from sklearn.metrics import auc as area_under_curve, roc_curve
 except:
     print('please install scikit-learn in order to make ROC curves')
     roc_curve = False
@@ -49,41 +50,60 @@ print('=========================')
 # load data
 X, y = qg_nsubs.load(num_data=num_data)
 
-# convert labels to categorical
-Y = to_categorical(y, num_classes=2)
+# keep integer class labels, used with a sparse loss instead of one-hot encoding them
+y = np.asarray(y, dtype=np.int8)
 
 print('Loaded quark and gluon jets')
 print('Model summary:')
 
+# do train/val/test split once, so that every model sees the same jets
+(X_all_train, X_all_val, X_all_test,
+ y_train, y_val, y_test) = data_split(X, y, val=val_frac, test=test_frac, shuffle_seed=42)
+
+print('Done train/val/test split')
+
 # train models with different numbers of nsubs as input
 rocs = []
 for i,num_nsub in enumerate(num_nsubs):
 
     # build architecture
-    dnn = DNN(input_dim=num_nsub, dense_sizes=dense_sizes, summary=(i==0))
-
-    # do train/val/test split 
-    (X_train, X_val, X_test,
-     Y_train, Y_val, Y_test) = data_split(X[:,:num_nsub], Y, val=val_frac, test=test_frac)
-
-    print('Done train/val/test split')
+    dnn = DNN(input_dim=num_nsub, dense_sizes=dense_sizes, loss='sparse_categorical_crossentropy',
+              summary=(i==0))
+
+    # select the leading nsubs
+    X_train, X_val, X_test = X_all_train[:,:num_nsub], X_all_val[:,:num_nsub], X_all_test[:,:num_nsub]
+
+    # build input pipelines that overlap host-to-device copies with training
+    train_ds = (tf.data.Dataset.from_tensor_slices((X_train, y_train))
+                               .cache()
+                               .shuffle(len(X_train))
+                               .batch(batch_size)
+                               .prefetch(tf.data.AUTOTUNE))
+    val_ds = (tf.data.Dataset.from_tensor_slices((X_val, y_val))
+                             .batch(batch_size)
+                             .cache()
+                             .prefetch(tf.data.AUTOTUNE))
 
     # train model
-    dnn.fit(X_train, Y_train,
+    dnn.fit(train_ds,
               epochs=num_epoch,
-              batch_size=batch_size,
-              validation_data=(X_val, Y_val),
+              validation_data=val_ds,
               verbose=1)
 
+    # compile the forward pass with XLA, the test set is small enough for a single call
+    @tf.function(jit_compile=True)
+    def infer(x):
+        return dnn.model(x, training=False)
+
     # get predictions on test data
-    preds = dnn.predict(X_test, batch_size=1000)
+    preds = infer(tf.constant(X_test)).numpy()
 
     # get ROC curve if we have sklearn
     if roc_curve:
-        rocs.append(roc_curve(Y_test[:,1], preds[:,1]))
+        rocs.append(roc_curve(y_test, preds[:,1]))
 
-        # get area under the ROC curve
-        auc = roc_auc_score(Y_test[:,1], preds[:,1])
+        # get area under the ROC curve, integrating the curve rather than sorting the predictions again
+        auc = area_under_curve(rocs[-1][0], rocs[-1][1])
         print()
         print('{} nsubs DNN AUC:'.format(num_nsub), auc)
         print()
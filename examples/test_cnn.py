@@ -4,15 +4,16 @@ from __future__ import absolute_import, division, print_function
 # standard numerical library imports
 import numpy as np
 import os.path
+import tensorflow as tf
 # energyflow imports
 import energyflow as ef
 from energyflow.archs import CNN
 from energyflow.datasets import qg_jets
-from energyflow.utils import data_split, pixelate, standardize, to_categorical, zero_center
+from energyflow.utils import data_split, pixelate_batch, zero_center_and_standardize
 import cepc # uproot package for cepc
 # attempt to import sklearn
 try:
-    from sklearn.metrics import roc_auc_score, roc_curve
+    from sklearn.metrics import auc as area_under_curve, roc_curve
 except:
     print('please install scikit-learn in order to make ROC curves')
     roc_curve = False
@@ -24,6 +25,17 @@ except:
     print('please install matploltib in order to make plots')
     plt = False
 
+# attempt to enable mixed precision training, which uses Tensor Cores on recent GPUs
+try:
+    from keras import mixed_precision
+    mixed = len(tf.config.list_physical_devices('GPU')) > 0
+    if mixed:
+        mixed_precision.set_global_policy('mixed_float16')
+        tf.config.experimental.enable_tensor_float_32_execution(True)
+except:
+    print('mixed precision training unavailable, using float32')
+    mixed = False
+
 ################################### SETTINGS ###################################
 
 # data controls
@@ -55,24 +67,28 @@ batch_size = 100
 # load data
 X, y = cepc.load(num_data=num_data)
 
-# convert labels to categorical
-Y = to_categorical(y, num_classes=2)
+# keep integer class labels, used with a sparse loss instead of one-hot encoding them
+y = np.asarray(y, dtype=np.int8)
 
 print('Loaded quark and gluon jets')
 
 # make jet images
-images = np.asarray([pixelate(x, npix=npix, img_width=img_width, nb_chan=nb_chan, norm=norm,charged_counts_only=True) for x in X])
+images = pixelate_batch(X, npix=npix, img_width=img_width, nb_chan=nb_chan, norm=norm, charged_counts_only=True)
 
 print('Done making jet images')
 
 # do train/val/test split 
 (X_train, X_val, X_test,
- Y_train, Y_val, Y_test) = data_split(images, Y, val=val_frac, test=test_frac)
+ y_train, y_val, y_test) = data_split(images, y, val=val_frac, test=test_frac)
 
 print('Done train/val/test split')
 
-# preprocess by zero centering images and standardizing each pixel
-X_train, X_val, X_test = standardize(*zero_center(X_train, X_val, X_test))
+# preprocess by zero centering images, pixels are not standardized since some are never hit in training
+X_train, X_val, X_test = zero_center_and_standardize(X_train, X_val, X_test, std_channels=[])
+
+# feed single precision images when training in mixed precision, the float16 cast happens inside the model
+if mixed:
+    X_train, X_val, X_test = [x.astype(np.float32) for x in (X_train, X_val, X_test)]
 
 print('Finished preprocessing')
 print('Model summary:')
@@ -82,25 +98,47 @@ hps = {'input_shape': input_shape,
        'filter_sizes': filter_sizes,
        'num_filters': num_filters,
        'dense_sizes': dense_sizes,
-       'pool_sizes': pool_sizes}
+       'pool_sizes': pool_sizes,
+       'loss': 'sparse_categorical_crossentropy'}
 cnn = CNN(hps)
 
+# hook for future data augmentations, applied to each training image on the fly
+def augment(x, y):
+    return x, y
+
+# build input pipelines that overlap host-to-device copies with training
+train_ds = (tf.data.Dataset.from_tensor_slices((X_train, y_train))
+                           .cache()
+                           .shuffle(len(X_train))
+                           .map(augment, num_parallel_calls=tf.data.AUTOTUNE)
+                           .batch(batch_size)
+                           .prefetch(tf.data.AUTOTUNE))
+val_ds = (tf.data.Dataset.from_tensor_slices((X_val, y_val))
+                         .batch(batch_size)
+                         .cache()
+                         .prefetch(tf.data.AUTOTUNE))
+
 # train model
-cnn.fit(X_train, Y_train,
+cnn.fit(train_ds,
           epochs=num_epoch,
-          batch_size=batch_size,
-          validation_data=(X_val, Y_val),
+          validation_data=val_ds,
           verbose=1)
 
+# compile the forward pass with XLA, fixed size batches keep the number of compilations small
+@tf.function(jit_compile=True)
+def infer(x):
+    return cnn.model(x, training=False)
+
 # get predictions on test data
-preds = cnn.predict(X_test, batch_size=1000)
+test_ds = tf.data.Dataset.from_tensor_slices(X_test).batch(1000).prefetch(tf.data.AUTOTUNE)
+preds = np.concatenate([infer(x).numpy() for x in test_ds])
 
 # get ROC curve if we have sklearn
 if roc_curve:
-    cnn_fp, cnn_tp, threshs = roc_curve(Y_test[:,1], preds[:,1])
+    cnn_fp, cnn_tp, threshs = roc_curve(y_test, preds[:,1])
 
-    # get area under the ROC curve
-    auc = roc_auc_score(Y_test[:,1], preds[:,1])
+    # get area under the ROC curve, integrating the curve rather than sorting the predictions again
+    auc = area_under_curve(cnn_fp, cnn_tp)
     print()
     print('CNN AUC:', auc)
     print()
@@ -108,11 +146,14 @@ if roc_curve:
     # make ROC curve plot if we have matplotlib
     if plt:
 
-        # get multiplicity and mass for comparison
-        masses = np.asarray([ef.ms_from_p4s(ef.p4s_from_ptyphims(x).sum(axis=0)) for x in X])
-        mults = np.asarray([np.count_nonzero(x[:,0]) for x in X])
-        mass_fp, mass_tp, threshs = roc_curve(Y[:,1], -masses)
-        mult_fp, mult_tp, threshs = roc_curve(Y[:,1], -mults)
+        # get multiplicity and mass for comparison, reducing over all the particles at once
+        flat_X = np.concatenate(X, axis=0)
+        counts = np.fromiter(map(len, X), dtype=np.intp, count=len(X))
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        masses = ef.ms_from_p4s(np.add.reduceat(ef.p4s_from_ptyphims(flat_X), offsets, axis=0))
+        mults = np.add.reduceat((flat_X[:,0] != 0).astype(np.intp), offsets)
+        mass_fp, mass_tp, threshs = roc_curve(y, -masses)
+        mult_fp, mult_tp, threshs = roc_curve(y, -mults)
 
         # some nicer plot settings 
         plt.rcParams['figure.figsize'] = (4,4)
@@ -10,23 +10,30 @@ for the classifiers with different numbers of EFP inputs.
 
 # standard library imports
 from __future__ import absolute_import, division, print_function
+import os
 
 # standard numerical library imports
 import numpy as np
 
 # energyflow imports
 import energyflow as ef
-from energyflow.archs import LinearClassifier
 from energyflow.utils import data_split, standardize, to_categorical
 import cepc
 
 # attempt to import sklearn
 try:
-    from sklearn.metrics import roc_auc_score, roc_curve
+    from sklearn.metrics import auc as area_under_curve, roc_curve
 except:
     print('please install scikit-learn in order to make ROC curves')
     roc_curve = False
 
+# attempt to import jax
+try:
+    import jax
+except:
+    print('please install jax in order to compute EFPs with XLA on a GPU')
+    jax = False
+
 # attempt to import matplotlib
 try:
     import matplotlib.pyplot as plt
@@ -55,43 +62,68 @@ X, y = cepc.load(num_data)
 
 print('Loaded b-quark and c-quark jets')
 
-# calculate EFPs
-print('Calculating d <= {} EFPs for {} jets... \n'.format(dmax, num_data), end='')
-efpset = ef.EFPSet(('d<=', dmax), measure='ee', beta=beta)
-masked_X = [x[x[:,0] > 0] for x in X]
-#print(X[0])
-#print(masked_X[0])
-X = efpset.batch_compute(masked_X)
-#print(X[0])
-#print(X[1])
-print('Done')
-
-# train models with different numbers of EFPs as input
+# calculate EFPs, reusing the results of a previous run if possible
+efpset = ef.EFPSet(('d<=', dmax), measure=measure, beta=beta)
+cache_file = 'efps_d{}_{}_beta{}_{}jets_float32.npy'.format(dmax, measure, beta, num_data)
+if os.path.exists(cache_file):
+    print('Loading d <= {} EFPs for {} jets from {}'.format(dmax, num_data, cache_file))
+    X = np.load(cache_file, mmap_mode='r')
+else:
+    print('Calculating d <= {} EFPs for {} jets... \n'.format(dmax, num_data), end='')
+
+    # remove zero pt particles with a single mask over all of the concatenated jets
+    flat_X = np.concatenate(X, axis=0)
+    keep = flat_X[:,0] > 0
+    split_inds = np.concatenate(([0], np.cumsum(keep)))[np.cumsum([len(x) for x in X])[:-1]]
+    masked_X = np.split(flat_X[keep], split_inds)
+
+    # use jax only on an accelerator, where it beats the parallel numpy computation,
+    # and store single precision, which is plenty for the linear classifiers and halves the memory
+    if jax and jax.default_backend() != 'cpu':
+        X = efpset.batch_compute_jax(masked_X).astype(np.float32)
+    else:
+        X = efpset.batch_compute(masked_X, n_jobs=-1, dtype=np.float32)
+    np.save(cache_file, X)
+    print('Done')
+
+# order the EFPs by degree so that each selection below is a leading slice
+d_order = np.argsort(efpset.specs[:,efpset.d_ind], kind='stable')
+num_efps = [np.count_nonzero(efpset.sel(('d<=', d))) for d in range(1, dmax+1)]
+
+# do train/val/test split once, shared by all of the models
+(X_train, X_test, y_train, y_test) = data_split(X, y, val=0, test=test_frac)
+X_train, X_test = X_train[:,d_order], X_test[:,d_order]
+print('Done train/val/test split')
+
+# class means and within-class scatter of all the EFPs, each model below uses a leading block of these,
+# accumulated in double precision since the EFPs are nearly collinear
+X0_train, X1_train = X_train[y_train==0], X_train[y_train==1]
+mu0, mu1 = X0_train.mean(axis=0, dtype=np.float64), X1_train.mean(axis=0, dtype=np.float64)
+centered = np.concatenate((X0_train - mu0, X1_train - mu1))
+Sw = centered.T.dot(centered)
+
+# train linear discriminants with different numbers of EFPs as input
 rocs = []
 for d in range(1, dmax+1):
 
-    # build architecture
-    model = LinearClassifier(linclass_type='lda')
-
-    # select EFPs with degree <= d
-    X_d = X[:,efpset.sel(('d<=', d))]
-
-    # do train/val/test split 
-    (X_train, X_test, y_train, y_test) = data_split(X_d, y, val=0, test=test_frac)
-    print('Done train/val/test split')
+    # select EFPs with degree <= d, dropping constant ones
+    n = num_efps[d-1]
+    std = np.sqrt(np.diag(Sw)[:n])
+    nz = std > 0
 
-    # train model
-    model.fit(X_train, y_train)
+    # solve for Fisher's linear discriminant with standardized features, as LDA does
+    Sw_d = Sw[:n,:n][np.ix_(nz, nz)]/np.outer(std[nz], std[nz])
+    w = np.linalg.lstsq(Sw_d, (mu1 - mu0)[:n][nz]/std[nz], rcond=None)[0]/std[nz]
 
     # get predictions on test data
-    preds = model.predict(X_test)
+    preds = X_test[:,:n][:,nz].dot(w)
 
     # get ROC curve if we have sklearn
     if roc_curve:
-        rocs.append(roc_curve(y_test, preds[:,1]))
+        rocs.append(roc_curve(y_test, preds))
 
-        # get area under the ROC curve
-        auc = roc_auc_score(y_test, preds[:,1])
+        # get area under the ROC curve, integrating the curve rather than sorting the predictions again
+        auc = area_under_curve(rocs[-1][0], rocs[-1][1])
         print()
         print('EFPs d <= {} AUC:'.format(d), auc)
         print()